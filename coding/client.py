@@ -7,15 +7,113 @@ Automation client:
 - Print keys where 'valid' == True from response
 """
 
+import gzip
 import json
+import math
+import mmap
+import os
+import re
 import sys
 import logging
-from pathlib import Path
+from decimal import Decimal
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def _default(obj):
+    # ijson yields non-integer numbers as Decimal; the full parse would have made them floats
+    if isinstance(obj, Decimal):
+        value = float(obj)
+        if not math.isfinite(value):
+            # orjson would write inf as null; refuse it as allow_nan=False does
+            raise ValueError(f"Out of range float value: {obj}")
+        return value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _stdlib_dumps(obj) -> bytes:
+    # parsed input cannot be circular; NaN/Infinity are refused as requests' json= did
+    return json.dumps(
+        obj, separators=(",", ":"), allow_nan=False, check_circular=False, default=_default
+    ).encode("utf-8")
+
+def _reject_constant(name):
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+def _finite_float(text):
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"Number out of range: {text}")
+    return value
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    _dumps = _stdlib_dumps
+
+    try:
+        import simdjson
+    except ImportError:  # fall back to the stdlib parser
+        def _loads(data):
+            return json.loads(bytes(data))
+    else:
+        # simdjson.loads builds a new Parser per call; reuse one so its buffers are kept
+        _SIMDJSON_PARSER = simdjson.Parser()
+
+        def _loads(data):
+            try:
+                return _SIMDJSON_PARSER.parse(data, True)
+            except RuntimeError:  # BIGINT_ERROR on integers wider than 64 bits; stdlib keeps them
+                return json.loads(bytes(data))
+else:
+    # orjson silently turns integers wider than 64 bits into floats; any run of 19+ digits
+    # goes to the stdlib parser instead, which keeps them exact (and, like orjson, rejects
+    # NaN/Infinity and numbers such as 1e400 that overflow to inf)
+    _WIDE_NUMBER = re.compile(rb"\d{19}")
+
+    def _loads(data):
+        if _WIDE_NUMBER.search(data):
+            return json.loads(
+                bytes(data), parse_constant=_reject_constant, parse_float=_finite_float
+            )
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default)
+        except orjson.JSONEncodeError:  # integers wider than 64 bits
+            return _stdlib_dumps(obj)
+
+try:
+    import ijson
+except ImportError:  # streaming is optional; load_and_filter falls back to a full parse
+    ijson = None
+
+# High surrogate escape not followed by a low one, or low not preceded by a high one;
+# yajl decodes valid pairs correctly but turns these lone halves into '?'
+_LONE_SURROGATE = re.compile(
+    rb"\\u[dD][89abAB][0-9a-fA-F]{2}(?!\\u[dD][c-fC-F])"
+    rb"|(?<!\\u[dD][89abAB][0-9a-fA-F]{2})\\u[dD][c-fC-F][0-9a-fA-F]{2}"
+)
 
 # Config
 INPUT_FILE = "example.json"
 SERVICE_URL = "https://example.com/service/generate"
+REQUEST_ENCODING = None  # set to "gzip" if the service accepts compressed request bodies
+STREAM_MIN_BYTES = 256 * 1024 * 1024  # stream-filter inputs this large with ijson, if installed
+
+# Shared session so repeated calls reuse pooled connections. Only failed connects are
+# retried, at most 3 times: POST is not idempotent, so read errors, error statuses and
+# other failures (e.g. TLS certificate errors) fail on the first attempt. Worst case with
+# the 10 s timeout is 4 connect attempts plus 0+2+4 s backoff, about 46 s.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=64,
+        pool_maxsize=64,
+        max_retries=Retry(total=3, connect=3, read=0, other=0, status=0, backoff_factor=1),
+    ),
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,12 +123,17 @@ logging.basicConfig(
 def load_json(filename: str):
     """Read and parse JSON file."""
     try:
-        with open(filename, "r", encoding="utf-8") as fh:
-            return json.load(fh)
+        with open(filename, "rb") as fh:
+            # mmap rejects zero-length files, and pipes or procfs files report size 0
+            # even when they have data; read those instead
+            if os.fstat(fh.fileno()).st_size == 0:
+                return _loads(fh.read())
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return _loads(view)
     except FileNotFoundError:
         logging.error("Input file not found: %s", filename)
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:  # JSONDecodeError, or simdjson's ValueError
         logging.error("Invalid JSON in %s: %s", filename, e)
         sys.exit(2)
 
@@ -40,20 +143,79 @@ def filter_non_private(data: dict):
         logging.error("Expected a JSON object (dict) at root, got %s", type(data))
         sys.exit(3)
 
-    result = {k: v for k, v in data.items() if isinstance(v, dict) and v.get("private") is False}
+    result = {k: v for k, v in data.items() if type(v) is dict and v.get("private") is False}
     logging.info("Selected %d non-private entries from %d total", len(result), len(data))
     return result
 
-def post_json(payload: dict):
-    """Send JSON via POST to service."""
+def _has_lone_surrogate(fh) -> bool:
+    """Return True if the open (non-empty, regular) file has a lone surrogate \\u escape."""
+    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _LONE_SURROGATE.search(mm) is not None
+
+def load_and_filter(filename: str):
+    """Return entries with private=False, streaming inputs of STREAM_MIN_BYTES or more."""
     try:
-        resp = requests.post(SERVICE_URL, json=payload, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        size = os.stat(filename).st_size
+    except OSError:
+        size = 0  # let load_json report it
+    # below the threshold the orjson+mmap parse is faster and the memory saving is small;
+    # pipes and procfs files report size 0 and always take the full parse
+    if ijson is None or size < STREAM_MIN_BYTES:
+        return filter_non_private(load_json(filename))
+
+    result = {}
+    keys = set()
+    try:
+        with open(filename, "rb") as fh:
+            if _has_lone_surrogate(fh):
+                return filter_non_private(load_json(filename))
+            for k, v in ijson.kvitems(fh, ""):
+                keys.add(k)
+                if type(v) is dict and v.get("private") is False:
+                    result[k] = v
+                else:
+                    # a later duplicate key replaces the earlier value, as in the full parse
+                    result.pop(k, None)
+    except FileNotFoundError:
+        logging.error("Input file not found: %s", filename)
+        sys.exit(1)
+    except ijson.JSONError as e:
+        logging.error("Invalid JSON in %s: %s", filename, e)
+        sys.exit(2)
+
+    if not keys:
+        # kvitems yields nothing for an empty object or a non-object root;
+        # let the full parse report it
+        return filter_non_private(load_json(filename))
+
+    logging.info("Selected %d non-private entries from %d total", len(result), len(keys))
+    return result
+
+def post_json(body: bytes):
+    """Send pre-encoded JSON body via POST to service."""
+    headers = {"Content-Type": "application/json"}
+    if REQUEST_ENCODING == "gzip":
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+
+    try:
+        resp = SESSION.post(
+            SERVICE_URL,
+            data=body,
+            headers=headers,
+            timeout=10,
+        )
+        if resp.status_code >= 400:
+            kind = "Client" if resp.status_code < 500 else "Server"
+            raise requests.HTTPError(
+                f"{resp.status_code} {kind} Error: {resp.reason} for url: {resp.url}",
+                response=resp,
+            )
+        return _loads(resp.content)
     except requests.exceptions.RequestException as e:
         logging.error("HTTP request failed: %s", e)
         sys.exit(4)
-    except json.JSONDecodeError:
+    except ValueError:
         logging.error("Service returned invalid JSON")
         sys.exit(5)
 
@@ -63,15 +225,20 @@ def print_valid_keys(response: dict):
         logging.error("Expected dict in service response")
         sys.exit(6)
 
-    for key, value in response.items():
-        if isinstance(value, dict) and value.get("valid") is True:
-            print(key)
+    valid = [k for k, v in response.items() if type(v) is dict and v.get("valid") is True]
+    if valid:
+        # one write instead of a print() per key
+        sys.stdout.write("\n".join(valid) + "\n")
 
 def main():
-    data = load_json(INPUT_FILE)
-    filtered = filter_non_private(data)
-    response = post_json(filtered)
+    filtered = load_and_filter(INPUT_FILE)
+    try:
+        body = _dumps(filtered)
+    except (TypeError, ValueError) as e:
+        logging.error("Cannot encode payload as JSON: %s", e)
+        sys.exit(4)
+    response = post_json(body)
     print_valid_keys(response)
 
-if _name_ == "_main_":
+if __name__ == "__main__":
     main()